@@ -4,7 +4,7 @@ This module provides models for doing PSF/PRF-fitting photometry.
 """
 
 import copy
-import itertools
+import math
 import warnings
 from functools import lru_cache
 
@@ -27,6 +27,78 @@ class NonNormalizable(AstropyWarning):
     """
 
 
+def _spline_ev(tck, xi, yi):
+    """
+    Evaluate a bivariate spline at the points ``(xi[i], yi[i])``.
+
+    This calls the FITPACK ``bispeu`` routine directly with a cached
+    ``(tx, ty, c, kx, ky)`` spline representation, which avoids the
+    per-call Python overhead of
+    :py:meth:`~scipy.interpolate.RectBivariateSpline.ev`.
+
+    If the input coordinates form a regular (``np.meshgrid``-like) grid
+    of increasing values, which is the common case when evaluating a
+    model on an image cutout, then the FITPACK ``bispev`` grid
+    evaluation routine is used instead. It computes the spline basis
+    functions only once per row and column of the grid and gives
+    identical results.
+
+    Parameters
+    ----------
+    tck : tuple
+        A tuple of the spline knots along the x and y axes, the spline
+        coefficients, and the spline degrees along the x and y axes.
+
+    xi, yi : `~numpy.ndarray`
+        The float input coordinates.
+
+    Returns
+    -------
+    result : `~numpy.ndarray`
+        The spline values with the same (broadcast) shape as the input
+        coordinates.
+    """
+    try:
+        from scipy.interpolate._fitpack2 import dfitpack
+    except ImportError:  # pragma: no cover
+        # scipy < 1.8
+        from scipy.interpolate.fitpack2 import dfitpack
+
+    if xi.shape != yi.shape:
+        xi, yi = np.broadcast_arrays(xi, yi)
+    if xi.size == 0:
+        return np.zeros(xi.shape)
+
+    if xi.ndim == 2:
+        x = xi[0]
+        y = yi[:, 0]
+        if ((xi == x).all() and (yi == y[:, np.newaxis]).all()
+                and (x[1:] >= x[:-1]).all() and (y[1:] >= y[:-1]).all()):
+            values, ier = dfitpack.bispev(*tck, x, y)
+            if ier != 0:  # pragma: no cover
+                raise ValueError(f'Error code returned by bispev: {ier}')
+            # return a C-ordered array like the scattered-point path
+            return np.ascontiguousarray(values.T)
+
+    values, ier = dfitpack.bispeu(*tck, xi.ravel(), yi.ravel())
+    if ier != 0:  # pragma: no cover
+        raise ValueError(f'Error code returned by bispeu: {ier}')
+
+    return values.reshape(xi.shape)
+
+
+def _as_float(value):
+    """
+    Return a scalar or the first element of an array as a float.
+
+    The astropy base Model.__call__() method converts scalar model
+    parameters to size-1 arrays before calling evaluate().
+    """
+    if np.ndim(value) == 0:
+        return float(value)
+    return float(np.ravel(value)[0])
+
+
 class FittableImageModel(Fittable2DModel):
     r"""
     A fittable 2D model of an image allowing for image intensity scaling
@@ -145,8 +217,7 @@ class FittableImageModel(Fittable2DModel):
         self._normalization_constant = 1.0 / self._normalization_correction
 
         self._data = np.array(data, copy=True, dtype=float)
-
-        if not np.all(np.isfinite(self._data)):
+        if not np.isfinite(self._data).all():
             raise ValueError("All elements of input 'data' must be finite.")
 
         # set input image related parameters:
@@ -158,6 +229,10 @@ class FittableImageModel(Fittable2DModel):
         # set the origin of the coordinate system in image's pixel grid:
         self.origin = origin
 
+        # normalized image data, cached on first access
+        self._normalized_data = None
+        self._normalized_data_constant = None
+
         flux = self._initial_norm(flux, normalize)
 
         super().__init__(flux, x_0, y_0)
@@ -187,7 +262,7 @@ class FittableImageModel(Fittable2DModel):
             one desires to change the way the normalization factor is
             computed.
         """
-        return np.sum(self._data, dtype=float)
+        return float(np.add.reduce(self._data, axis=None))
 
     def _compute_normalization(self, normalize=True):
         r"""
@@ -213,8 +288,6 @@ class FittableImageModel(Fittable2DModel):
             one desires to change the way the normalization factor is
             computed.
         """
-        self._normalization_constant = 1.0 / self._normalization_correction
-
         if normalize:
             # compute normalization constant so that
             # N*C*sum(data) = 1:
@@ -222,7 +295,8 @@ class FittableImageModel(Fittable2DModel):
                 self._img_norm = self._compute_raw_image_norm()
 
             if self._img_norm != 0.0 and np.isfinite(self._img_norm):
-                self._normalization_constant /= self._img_norm
+                self._normalization_constant = 1.0 / (
+                    self._normalization_correction * self._img_norm)
                 self._normalization_status = 0
 
             else:
@@ -233,6 +307,8 @@ class FittableImageModel(Fittable2DModel):
                               "constant will be set to 1.", NonNormalizable)
 
         else:
+            self._normalization_constant = (1.0
+                                            / self._normalization_correction)
             self._normalization_status = 2
 
     @property
@@ -252,8 +328,22 @@ class FittableImageModel(Fittable2DModel):
 
     @property
     def normalized_data(self):
-        """Get normalized and/or intensity-corrected image data."""
-        return self._normalization_constant * self._data
+        """
+        Get normalized and/or intensity-corrected image data.
+
+        The returned array is cached and is read-only. Copy it if it
+        needs to be modified.
+        """
+        if (self._normalized_data is None
+                or self._normalized_data_constant
+                != self._normalization_constant):
+            normalized_data = np.multiply(self._data,
+                                          self._normalization_constant)
+            # the array is cached, so prevent it from being modified
+            normalized_data.flags.writeable = False
+            self._normalized_data = normalized_data
+            self._normalized_data_constant = self._normalization_constant
+        return self._normalized_data
 
     @property
     def normalization_constant(self):
@@ -289,6 +379,7 @@ class FittableImageModel(Fittable2DModel):
     def normalization_correction(self, normalization_correction):
         old_cf = self._normalization_correction
         self._normalization_correction = normalization_correction
+        self._normalized_data = None
         self._compute_normalization(normalize=self._normalization_status != 2)
 
         # adjust model's flux so that if this model was a good fit to
@@ -370,7 +461,12 @@ class FittableImageModel(Fittable2DModel):
         This function should be called in a subclass whenever model's
         interpolator is (re-)computed.
         """
-        self._interpolator_kwargs = copy.deepcopy(kwargs)
+        # the keyword arguments are typically scalars (e.g., degree and
+        # s), so only mutable values need to be deep copied
+        self._interpolator_kwargs = {
+            key: (copy.deepcopy(val)
+                  if isinstance(val, (list, dict, np.ndarray)) else val)
+            for key, val in kwargs.items()}
 
     @property
     def interpolator_kwargs(self):
@@ -380,6 +476,43 @@ class FittableImageModel(Fittable2DModel):
         """
         return self._interpolator_kwargs
 
+    @staticmethod
+    def _parse_spline_kwargs(kwargs):
+        """
+        Parse the interpolating spline keyword arguments.
+
+        Parameters
+        ----------
+        kwargs : dict
+            The ``compute_interpolator`` keyword arguments.
+
+        Returns
+        -------
+        degx, degy : int
+            The degrees of the spline along the x and y axes.
+
+        smoothness : float
+            The spline smoothing factor.
+        """
+        if 'degree' in kwargs:
+            degree = kwargs['degree']
+            if hasattr(degree, '__iter__') and len(degree) == 2:
+                degx = int(degree[0])
+                degy = int(degree[1])
+            else:
+                degx = int(degree)
+                degy = int(degree)
+            if degx < 0 or degy < 0:
+                raise ValueError("Interpolator degree must be a non-negative "
+                                 "integer")
+        else:
+            degx = 3
+            degy = 3
+
+        smoothness = kwargs.get('s', 0)
+
+        return degx, degy, smoothness
+
     def compute_interpolator(self, **kwargs):
         """
         Compute/define the interpolating spline.
@@ -420,28 +553,15 @@ class FittableImageModel(Fittable2DModel):
         """
         from scipy.interpolate import RectBivariateSpline
 
-        if 'degree' in kwargs:
-            degree = kwargs['degree']
-            if hasattr(degree, '__iter__') and len(degree) == 2:
-                degx = int(degree[0])
-                degy = int(degree[1])
-            else:
-                degx = int(degree)
-                degy = int(degree)
-            if degx < 0 or degy < 0:
-                raise ValueError("Interpolator degree must be a non-negative "
-                                 "integer")
-        else:
-            degx = 3
-            degy = 3
-
-        smoothness = kwargs.get('s', 0)
+        degx, degy, smoothness = self._parse_spline_kwargs(kwargs)
 
         x = np.arange(self._nx, dtype=float)
         y = np.arange(self._ny, dtype=float)
         self.interpolator = RectBivariateSpline(
             x, y, self._data.T, kx=degx, ky=degy, s=smoothness
         )
+        # cache the spline representation used by evaluate
+        self._tck = (*self.interpolator.tck, *self.interpolator.degrees)
 
         self._store_interpolator_kwargs(**kwargs)
 
@@ -458,26 +578,71 @@ class FittableImageModel(Fittable2DModel):
             input indices will be multiplied by this factor.
         """
         if use_oversampling:
-            xi = self._oversampling[1] * (np.asarray(x) - x_0)
-            yi = self._oversampling[0] * (np.asarray(y) - y_0)
+            osy, osx = self._oversampling
+        else:
+            osy = osx = 1.0
+
+        # transform the input coordinates to model pixel indices with a
+        # single scale and offset
+        xi = np.multiply(x, osx, dtype=float)
+        yi = np.multiply(y, osy, dtype=float)
+        xoffset = self._x_origin - osx * x_0
+        yoffset = self._y_origin - osy * y_0
+
+        # add the offsets in place unless the (array) model parameters
+        # broadcast the coordinates to a larger shape
+        if np.broadcast_shapes(xi.shape, np.shape(xoffset)) == xi.shape:
+            xi += xoffset
         else:
-            xi = np.asarray(x) - x_0
-            yi = np.asarray(y) - y_0
+            xi = xi + xoffset
+        if np.broadcast_shapes(yi.shape, np.shape(yoffset)) == yi.shape:
+            yi += yoffset
+        else:
+            yi = yi + yoffset
 
-        xi = xi.astype(float)
-        yi = yi.astype(float)
-        xi += self._x_origin
-        yi += self._y_origin
+        return self._evaluate_spline(xi, yi,
+                                     flux * self._normalization_constant,
+                                     self._nx - 1, self._ny - 1)
 
-        f = flux * self._normalization_constant
-        evaluated_model = f * self.interpolator.ev(xi, yi)
+    def _evaluate_spline(self, xi, yi, scale, xmax, ymax):
+        """
+        Evaluate the scaled spline interpolator at the ``(xi, yi)``
+        model pixel indices.
+
+        Points outside of the ``[0, xmax] x [0, ymax]`` domain are set
+        to ``fill_value`` (if it is not `None`). The minimum and maximum
+        input indices are checked first so that the invalid-pixel mask
+        is computed only if some (but not all) of the points are
+        outside of the domain.
+        """
+        fill = False
+        if self._fill_value is not None and xi.size > 0 and yi.size > 0:
+            xlo, xhi = xi.min(), xi.max()
+            ylo, yhi = yi.min(), yi.max()
+            if xhi < 0 or xlo > xmax or yhi < 0 or ylo > ymax:
+                # all points are outside of the domain
+                shape = np.broadcast_shapes(xi.shape, yi.shape,
+                                            np.shape(scale))
+                return np.full(shape, self._fill_value, dtype=float)
+            fill = not (xlo >= 0 and xhi <= xmax
+                        and ylo >= 0 and yhi <= ymax)
+
+        evaluated_model = _spline_ev(self._tck, xi, yi)
+        if np.size(scale) == 1:
+            # scale the newly-allocated spline values in place
+            evaluated_model *= np.ravel(scale)[0]
+        else:
+            evaluated_model = scale * evaluated_model
 
-        if self._fill_value is not None:
+        if fill:
             # find indices of pixels that are outside the input pixel grid and
             # set these pixels to the 'fill_value':
-            invalid = (((xi < 0) | (xi > self._nx - 1))
-                       | ((yi < 0) | (yi > self._ny - 1)))
-            evaluated_model[invalid] = self._fill_value
+            invalid = np.less(xi, 0, out=np.empty(evaluated_model.shape,
+                                                  dtype=bool))
+            np.logical_or(invalid, xi > xmax, out=invalid)
+            np.logical_or(invalid, yi < 0, out=invalid)
+            np.logical_or(invalid, yi > ymax, out=invalid)
+            np.copyto(evaluated_model, self._fill_value, where=invalid)
 
         return evaluated_model
 
@@ -556,13 +721,14 @@ class EPSFModel(FittableImageModel):
         """
         if normalize:
             if self._img_norm is None:
-                if np.sum(self._data) == 0:
+                if np.add.reduce(self._data, axis=None) == 0:
                     self._img_norm = 1
                 else:
                     self._img_norm = self._compute_raw_image_norm()
 
             if self._img_norm != 0.0 and np.isfinite(self._img_norm):
-                self._data /= (self._img_norm * self._normalization_correction)
+                self._data /= (self._img_norm
+                               * self._normalization_correction)
                 self._normalization_status = 0
             else:
                 self._normalization_status = 1
@@ -634,22 +800,7 @@ class EPSFModel(FittableImageModel):
         """
         from scipy.interpolate import RectBivariateSpline
 
-        if 'degree' in kwargs:
-            degree = kwargs['degree']
-            if hasattr(degree, '__iter__') and len(degree) == 2:
-                degx = int(degree[0])
-                degy = int(degree[1])
-            else:
-                degx = int(degree)
-                degy = int(degree)
-            if degx < 0 or degy < 0:
-                raise ValueError("Interpolator degree must be a non-negative "
-                                 "integer")
-        else:
-            degx = 3
-            degy = 3
-
-        smoothness = kwargs.get('s', 0)
+        degx, degy, smoothness = self._parse_spline_kwargs(kwargs)
 
         # Interpolator must be set to interpolate on the undersampled
         # pixel grid, going from 0 to len(undersampled_grid)
@@ -657,6 +808,8 @@ class EPSFModel(FittableImageModel):
         y = np.arange(self._ny, dtype=float) / self.oversampling[0]
         self.interpolator = RectBivariateSpline(
             x, y, self._data.T, kx=degx, ky=degy, s=smoothness)
+        # cache the spline representation used by evaluate
+        self._tck = (*self.interpolator.tck, *self.interpolator.degrees)
 
         self._store_interpolator_kwargs(**kwargs)
 
@@ -668,18 +821,9 @@ class EPSFModel(FittableImageModel):
         xi = np.asarray(x) - x_0 + self._x_origin
         yi = np.asarray(y) - y_0 + self._y_origin
 
-        evaluated_model = flux * self.interpolator.ev(xi, yi)
-
-        if self._fill_value is not None:
-            # find indices of pixels that are outside the input pixel
-            # grid and set these pixels to the 'fill_value':
-            invalid = (((xi < 0) | (xi > (self._nx - 1)
-                                    / self.oversampling[1]))
-                       | ((yi < 0) | (yi > (self._ny - 1)
-                                      / self.oversampling[0])))
-            evaluated_model[invalid] = self._fill_value
-
-        return evaluated_model
+        return self._evaluate_spline(xi, yi, flux,
+                                     (self._nx - 1) / self.oversampling[1],
+                                     (self._ny - 1) / self.oversampling[0])
 
 
 class GriddedPSFModel(Fittable2DModel):
@@ -722,26 +866,74 @@ class GriddedPSFModel(Fittable2DModel):
 
         self._data_input = self._validate_data(data)
         self.data = data.data
+        # the reference PSFs bounding the evaluation position are
+        # gathered along the first axis, so keep them as contiguous
+        # (N_psf, PSF_ny, PSF_nx) float slabs; float32 data are not
+        # upcast because the spline fits are computed in float64
+        self._data = np.ascontiguousarray(
+            self.data, dtype=np.result_type(self.data.dtype, np.float32))
         self._meta = data.meta  # use _meta to avoid the meta descriptor
         self.grid_xypos = data.meta['grid_xypos']
         self.oversampling = data.meta['oversampling']
         self.fill_value = fill_value
 
-        self._grid_xpos, self._grid_ypos = np.transpose(self.grid_xypos)
+        # convert the grid positions to a float array once and store
+        # contiguous copies of the x and y columns
+        self._grid_xypos = np.ascontiguousarray(self.grid_xypos,
+                                                dtype=float)
+        self._grid_xpos = np.ascontiguousarray(self._grid_xypos[:, 0])
+        self._grid_ypos = np.ascontiguousarray(self._grid_xypos[:, 1])
         self._xgrid = np.unique(self._grid_xpos)  # also sorts values
         self._ygrid = np.unique(self._grid_ypos)  # also sorts values
-        if (len(list(itertools.product(self._xgrid, self._ygrid)))
-                != len(self.grid_xypos)):
+        self._xstep = self._grid_step(self._xgrid)
+        self._ystep = self._grid_step(self._ygrid)
+        npts = len(self._grid_xypos)
+        if (len(self._xgrid) * len(self._ygrid) != npts
+                or len(np.unique(self._grid_xypos, axis=0)) != npts):
             raise ValueError('"grid_xypos" must form a regular grid.')
 
+        # precompute the indices of the reference PSFs at the four
+        # corners of each grid cell, with shape (nx - 1, ny - 1, 4);
+        # a grid with a single x or y value has no grid cells, in which
+        # case the nearest reference PSF is used
+        if len(self._xgrid) > 1 and len(self._ygrid) > 1:
+            grid_index = np.empty((len(self._xgrid), len(self._ygrid)),
+                                  dtype=np.intp)
+            grid_index[np.searchsorted(self._xgrid, self._grid_xpos),
+                       np.searchsorted(self._ygrid, self._grid_ypos)] = (
+                           np.arange(npts))
+            cell_windows = np.lib.stride_tricks.sliding_window_view(
+                grid_index, (2, 2))
+            self._cell_ref_indices = cell_windows.reshape(
+                *cell_windows.shape[:2], 4)
+            self._cell_ref_indices.flags.writeable = False
+        else:
+            self._cell_ref_indices = None
+
         self._xidx = np.arange(self.data.shape[2], dtype=float)
         self._yidx = np.arange(self.data.shape[1], dtype=float)
 
+        # the PSF image center, which is the origin of the evaluation
+        # coordinates
+        self._x_center = (self.data.shape[2] - 1) / 2
+        self._y_center = (self.data.shape[1] - 1) / 2
+
         # Here we avoid decorating the instance method with @lru_cache
         # to prevent memory leaks; we set maxsize=128 to prevent the
-        # cache from growing too large.
+        # cache from growing too large. The spline coefficients of all
+        # the reference PSFs have the same total size as the input
+        # data, so they are all kept such that each spline is computed
+        # at most once.
         self._calc_interpolator = lru_cache(maxsize=128)(
             self._calc_interpolator_uncached)
+        self._calc_spline = lru_cache(maxsize=npts)(
+            self._calc_spline_uncached)
+
+        # the interpolated spline coefficients of the last evaluated
+        # position, keyed on (xidx, yidx, x_0, y_0); fitters evaluate
+        # the model repeatedly at an unchanged position (e.g., for the
+        # flux and derivative steps)
+        self._coeff_memo = None
 
         super().__init__(flux, x_0, y_0)
 
@@ -791,6 +983,8 @@ class GriddedPSFModel(Fittable2DModel):
         Clear the internal cache.
         """
         self._calc_interpolator.cache_clear()
+        self._calc_spline.cache_clear()
+        self._coeff_memo = None
 
     def _cache_info(self):
         """
@@ -799,185 +993,348 @@ class GriddedPSFModel(Fittable2DModel):
         return self._calc_interpolator.cache_info()
 
     @staticmethod
-    def _find_start_idx(data, x):
+    def _grid_step(grid):
+        """
+        Return the spacing of a uniformly-spaced 1D grid or `None` if
+        the grid is not uniformly spaced.
         """
-        Find the index of the lower bound where ``x`` should be inserted
-        into ``a`` to maintain order.
+        steps = np.diff(grid)
+        if steps.size > 0 and np.all(steps == steps[0]):
+            return float(steps[0])
+        return None
 
-        The index of the upper bound is the index of the lower bound
-        plus 2.  Both bound indices must be within the array.
+    @staticmethod
+    def _find_cell_index(grid, step, value):
+        """
+        Find the index of the lower bound of the grid cell containing
+        ``value``.
+
+        Values outside of the grid are assigned to the nearest grid
+        cell.
 
         Parameters
         ----------
-        data : 1D `~numpy.ndarray`
-            The 1D array to search.
+        grid : 1D `~numpy.ndarray`
+            The sorted grid values.
+
+        step : float or `None`
+            The grid spacing if the grid is uniformly spaced, otherwise
+            `None`.
 
-        x : float
-            The value to insert.
+        value : float
+            The value to locate.
 
         Returns
         -------
         index : int
-            The index of the lower bound.
+            The index of the lower bound of the grid cell.
         """
-        idx = np.searchsorted(data, x)
-        if idx == 0:
-            idx0 = 0
-        elif idx == len(data):  # pragma: no cover
-            idx0 = idx - 2
-        else:
-            idx0 = idx - 1
-        return idx0
-
-    def _find_bounding_points(self, x, y):
+        nmax = len(grid) - 2
+        if step is None or not math.isfinite(value):
+            idx = int(np.searchsorted(grid, value)) - 1
+            return min(max(idx, 0), nmax)
+
+        # for a uniform grid, compute the index directly instead of
+        # using a binary search, then correct for any rounding error
+        # at the cell boundaries
+        idx = min(max(math.ceil((value - grid[0]) / step) - 1, 0), nmax)
+        if idx < nmax and value > grid[idx + 1]:
+            idx += 1
+        elif idx > 0 and value <= grid[idx]:
+            idx -= 1
+
+        return idx
+
+    def _locate(self, x_0, y_0):
         """
-        Find the indices of the grid points that bound the input
-        ``(x, y)`` position.
+        Find the grid cell containing the ``(x_0, y_0)`` position and
+        the fractional position within the cell.
+
+        Positions outside of the grid are assigned to the nearest grid
+        cell, in which case the fractional position is outside of the
+        [0, 1] interval.
 
         Parameters
         ----------
-        x, y : float
-            The ``(x, y)`` position where the PSF is to be evaluated.
-            The position must be inside the region defined by the grid
-            of PSF positions.
+        x_0, y_0 : float
+            The ``(x, y)`` position.
 
         Returns
         -------
-        indices : list of int
-            A list of indices of the bounding grid points.
+        xidx, yidx : int
+            The indices of the lower bounds of the grid cell in the
+            ``_xgrid`` and ``_ygrid`` arrays.
+
+        xfrac, yfrac : float
+            The fractional position within the grid cell.
         """
-        x0 = self._find_start_idx(self._xgrid, x)
-        y0 = self._find_start_idx(self._ygrid, y)
-        xypoints = list(itertools.product(self._xgrid[x0:x0 + 2],
-                                          self._ygrid[y0:y0 + 2]))
+        xgrid = self._xgrid
+        ygrid = self._ygrid
+        xidx = self._find_cell_index(xgrid, self._xstep, x_0)
+        yidx = self._find_cell_index(ygrid, self._ystep, y_0)
+        xfrac = (x_0 - xgrid[xidx]) / (xgrid[xidx + 1] - xgrid[xidx])
+        yfrac = (y_0 - ygrid[yidx]) / (ygrid[yidx + 1] - ygrid[yidx])
+
+        return xidx, yidx, xfrac, yfrac
 
-        # find the grid_xypos indices of the reference xypoints
-        indices = []
-        for xx, yy in xypoints:
-            indices.append(np.argsort(np.hypot(self._grid_xpos - xx,
-                                               self._grid_ypos - yy))[0])
+    def _find_bounding_points(self, xidx, yidx):
+        """
+        Find the indices of the reference PSFs at the corners of a grid
+        cell.
 
-        return indices
+        Parameters
+        ----------
+        xidx, yidx : int
+            The indices of the lower bounds of the grid cell in the
+            ``_xgrid`` and ``_ygrid`` arrays.
+
+        Returns
+        -------
+        indices : 1D `~numpy.ndarray`
+            A read-only array of the indices of the bounding grid
+            points, sorted by x and then y, i.e., in ``(x0, y0)``,
+            ``(x0, y1)``, ``(x1, y0)``, ``(x1, y1)`` order.
+        """
+        return self._cell_ref_indices[xidx, yidx]
 
     @staticmethod
-    def _bilinear_interp(xyref, zref, xi, yi):
+    def _bilinear_weights(xfrac, yfrac):
         """
-        Perform bilinear interpolation of four 2D arrays located at
-        points on a regular grid.
+        Compute the bilinear interpolation weights of the corners of a
+        rectangle.
 
         Parameters
         ----------
-        xyref : list of 4 (x, y) pairs
-            A list of 4 ``(x, y)`` pairs that form a rectangle.
+        xfrac, yfrac : float
+            The fractional position within the rectangle along the x
+            and y axes, where 0 and 1 correspond to the lower and upper
+            bounds.
+
+        Returns
+        -------
+        weights : list of 4 floats
+            The weights of the ``(x0, y0)``, ``(x0, y1)``, ``(x1, y0)``,
+            and ``(x1, y1)`` corners, in that (sorted) order. The
+            weights sum to 1.
+        """
+        return [(1 - xfrac) * (1 - yfrac), (1 - xfrac) * yfrac,
+                xfrac * (1 - yfrac), xfrac * yfrac]
 
-        zref : 3D `~numpy.ndarray`
-            A 3D `~numpy.ndarray` of shape ``(4, nx, ny)``. The first
-            axis corresponds to ``xyref``, i.e., ``refdata[0, :, :]`` is
-            the 2D array located at ``xyref[0]``.
+    def _calc_spline_uncached(self, index):
+        """
+        Return the spline representation of a reference PSF.
+
+        The spline coefficients of each reference PSF are computed only
+        once, even though the PSF is shared by up to four grid cells.
 
-        xi, yi : float
-            The ``(xi, yi)`` point at which to perform the
-            interpolation.  The ``(xi, yi)`` point must lie within the
-            rectangle defined by ``xyref``.
+        Note that the result will be cached by _calc_spline. It can be
+        cleared by calling the clear_cache method.
+
+        Parameters
+        ----------
+        index : int
+            The index of the reference PSF.
 
         Returns
         -------
-        result : 2D `~numpy.ndarray`
-            The 2D interpolated array.
+        tck : tuple
+            The spline knots along the x and y axes and the spline
+            coefficients.
         """
-        xyref = [tuple(i) for i in xyref]
-        idx = sorted(range(len(xyref)), key=xyref.__getitem__)
-        xyref = sorted(xyref)  # sort by x, then y
-        (x0, y0), (_x0, y1), (x1, _y0), (_x1, _y1) = xyref
+        from scipy.interpolate import RectBivariateSpline
 
-        if x0 != _x0 or x1 != _x1 or y0 != _y0 or y1 != _y1:
-            raise ValueError('The refxy points do not form a rectangle.')
+        spline = RectBivariateSpline(self._xidx, self._yidx,
+                                     self._data[index].T, kx=3, ky=3, s=0)
+        return spline.tck
 
-        if not np.isscalar(xi):
-            xi = xi[0]
-        if not np.isscalar(yi):
-            yi = yi[0]
+    def _calc_interpolator_uncached(self, xidx, yidx):
+        """
+        Return the spline representations of the four reference PSFs
+        at the corners of the grid cell whose lower bounds are at
+        indices ``(xidx, yidx)``.
 
-        if not x0 <= xi <= x1 or not y0 <= yi <= y1:
-            raise ValueError('The (x, y) input is not within the rectangle '
-                             'defined by xyref.')
+        The splines of all reference PSFs share the same knots. Because
+        a spline is linear in the interpolated data, the spline of the
+        bilinearly-interpolated PSF at any position within the cell is
+        given by the same bilinear interpolation of the spline
+        coefficients.
 
-        data = np.asarray(zref)[idx]
-        weights = np.array([(x1 - xi) * (y1 - yi), (x1 - xi) * (yi - y0),
-                            (xi - x0) * (y1 - yi), (xi - x0) * (yi - y0)])
-        norm = (x1 - x0) * (y1 - y0)
+        Note that the result will be cached by _calc_interpolator. It
+        can be cleared by calling the clear_cache method.
 
-        return np.sum(data * weights[:, None, None], axis=0) / norm
+        Returns
+        -------
+        knots : tuple of 1D `~numpy.ndarray`
+            The spline knots along the x and y axes.
 
-    def _calc_interpolator_uncached(self, x_0, y_0):
+        coeffs : tuple of 1D `~numpy.ndarray`
+            The spline coefficients of the four reference PSFs. These
+            are references to the coefficients cached by
+            ``_calc_spline`` (not copies), so each cache entry is small.
         """
-        Return the local interpolation function for the PSF model at
-        (x_0, y_0).
+        ref_indices = self._find_bounding_points(xidx, yidx)
+        tcks = [self._calc_spline(index) for index in ref_indices]
+        knots = tcks[0][:2]
+        coeffs = tuple(tck[2] for tck in tcks)
+
+        return knots, coeffs
 
-        Note that the interpolator will be cached by _calc_interpolator.
-        It can be cleared by calling the clear_cache method.
+    @staticmethod
+    def _interpolate_coeffs(weights, coeffs):
         """
-        from scipy.interpolate import RectBivariateSpline
+        Compute the weighted sum of the reference PSF spline
+        coefficients.
 
-        if (x_0 < self._xgrid[0] or x_0 > self._xgrid[-1]
-                or y_0 < self._ygrid[0] or y_0 > self._ygrid[-1]):
-            # position is outside of the grid, so simply use the
-            # closest reference PSF
-            ref_index = np.argsort(np.hypot(self._grid_xpos - x_0,
-                                            self._grid_ypos - y_0))[0]
-            psf_image = self.data[ref_index, :, :]
-        else:
-            # find the four bounding reference PSFs and interpolate
-            ref_indices = self._find_bounding_points(x_0, y_0)
-            xyref = np.array(self.grid_xypos)[ref_indices]
-            psfs = self.data[ref_indices, :, :]
+        Reference PSFs with zero weight (e.g., for positions outside
+        of the grid or on a grid line) are skipped.
+
+        Parameters
+        ----------
+        weights : list of 4 floats
+            The bilinear interpolation weights of the reference PSFs.
+
+        coeffs : tuple of 4 1D `~numpy.ndarray`
+            The spline coefficients of the reference PSFs.
 
-            psf_image = self._bilinear_interp(xyref, psfs, x_0, y_0)
+        Returns
+        -------
+        coeff : 1D `~numpy.ndarray`
+            The interpolated spline coefficients.
+        """
+        coeff = None
+        for weight, ref_coeff in zip(weights, coeffs):
+            if weight == 0:
+                continue
+            if coeff is None:
+                coeff = ref_coeff * weight
+            else:
+                coeff += ref_coeff * weight
 
-        interpolator = RectBivariateSpline(self._xidx, self._yidx,
-                                           psf_image.T, kx=3, ky=3, s=0)
+        return coeff
 
-        return interpolator
+    def _calc_weights(self, x_0, y_0):
+        """
+        Find the grid cell containing the ``(x_0, y_0)`` position and
+        the bilinear interpolation weights of its corner reference
+        PSFs.
 
-    def evaluate(self, x, y, flux, x_0, y_0):
+        Positions outside of the grid are assigned to the nearest grid
+        cell and use the closest reference PSF (i.e., the closest cell
+        corner).
+
+        Parameters
+        ----------
+        x_0, y_0 : float
+            The ``(x, y)`` position.
+
+        Returns
+        -------
+        xidx, yidx : int
+            The indices of the lower bounds of the grid cell in the
+            ``_xgrid`` and ``_ygrid`` arrays.
+
+        weights : list of 4 floats
+            The weights of the sorted cell corners.
         """
-        Evaluate the `GriddedPSFModel` for the input parameters.
+        xidx, yidx, xfrac, yfrac = self._locate(x_0, y_0)
+
+        if not (0 <= xfrac <= 1 and 0 <= yfrac <= 1):
+            # position is outside of the grid, so simply use the
+            # closest reference PSF (i.e., the closest cell corner)
+            xfrac = float(xfrac > 0.5)
+            yfrac = float(yfrac > 0.5)
+
+        return xidx, yidx, self._bilinear_weights(xfrac, yfrac)
+
+    def _calc_nearest_spline(self, x_0, y_0):
         """
-        # NOTE: the astropy base Model.__call__() method converts scalar
-        # inputs to size-1 arrays before calling evaluate().
-        if not np.isscalar(flux):
-            flux = flux[0]
-        if not np.isscalar(x_0):
-            x_0 = x_0[0]
-        if not np.isscalar(y_0):
-            y_0 = y_0[0]
+        Return the spline representation of the reference PSF closest
+        to the ``(x_0, y_0)`` position.
 
-        # Calculate the local interpolation function for the PSF at
-        # (x_0, y_0). Only the integer part of the position is input in
-        # order to have effective caching.
-        interpolator = self._calc_interpolator(int(x_0), int(y_0))
+        This is used for grids with a single x or y grid value, which
+        have no grid cells to interpolate within.
 
-        # now evaluate the PSF at the (x_0, y_0) subpixel position on
-        # the input (x, y) values
-        xi = self.oversampling * (np.asarray(x, dtype=float) - x_0)
-        yi = self.oversampling * (np.asarray(y, dtype=float) - y_0)
+        Returns
+        -------
+        knots : tuple of 1D `~numpy.ndarray`
+            The spline knots along the x and y axes.
 
-        # define origin at the PSF image center
-        ny, nx = self.data.shape[1:]
-        xi += (nx - 1) / 2
-        yi += (ny - 1) / 2
+        coeff : 1D `~numpy.ndarray`
+            The spline coefficients.
+        """
+        ref_index = int(np.argmin(np.hypot(self._grid_xpos - x_0,
+                                           self._grid_ypos - y_0)))
+        tck = self._calc_spline(ref_index)
+
+        return tck[:2], tck[2]
+
+    def _evaluate_interpolated(self, x, y, flux, x_0, y_0, knots, coeff):
+        """
+        Evaluate the PSF spline interpolated at the ``(x_0, y_0)``
+        position on the input ``(x, y)`` values.
+        """
+        tck = (*knots, coeff.ravel(), 3, 3)
+
+        # the transformation to PSF image pixel indices is done in
+        # place, with the origin at the PSF image center
+        xi = np.subtract(x, x_0, dtype=float)
+        yi = np.subtract(y, y_0, dtype=float)
+        xi *= self.oversampling
+        yi *= self.oversampling
+        xi += self._x_center
+        yi += self._y_center
 
-        evaluated_model = flux * interpolator.ev(xi, yi)
+        # scale the newly-allocated spline values in place
+        evaluated_model = _spline_ev(tck, xi, yi)
+        evaluated_model *= flux
 
         if self.fill_value is not None:
             # find indices of pixels that are outside the input pixel
             # grid and set these pixels to the fill_value
-            invalid = (((xi < 0) | (xi > nx - 1))
-                       | ((yi < 0) | (yi > ny - 1)))
-            evaluated_model[invalid] = self.fill_value
+            ny, nx = self.data.shape[1:]
+            invalid = np.less(xi, 0, out=np.empty(evaluated_model.shape,
+                                                  dtype=bool))
+            np.logical_or(invalid, xi > nx - 1, out=invalid)
+            np.logical_or(invalid, yi < 0, out=invalid)
+            np.logical_or(invalid, yi > ny - 1, out=invalid)
+            np.copyto(evaluated_model, self.fill_value, where=invalid)
 
         return evaluated_model
 
+    def evaluate(self, x, y, flux, x_0, y_0):
+        """
+        Evaluate the `GriddedPSFModel` for the input parameters.
+        """
+        flux = _as_float(flux)
+        x_0 = _as_float(x_0)
+        y_0 = _as_float(y_0)
+
+        if self._cell_ref_indices is None:
+            knots, coeff = self._calc_nearest_spline(x_0, y_0)
+            return self._evaluate_interpolated(x, y, flux, x_0, y_0, knots,
+                                               coeff)
+
+        # Get the spline representations of the reference PSFs of the
+        # grid cell containing (x_0, y_0). The cache is keyed on the
+        # grid cell, so it is shared by all positions within the cell.
+        xidx, yidx, weights = self._calc_weights(x_0, y_0)
+        key = (xidx, yidx, x_0, y_0)
+        if self._coeff_memo is not None and self._coeff_memo[0] == key:
+            knots, coeff = self._coeff_memo[1:]
+        else:
+            knots, coeffs = self._calc_interpolator(xidx, yidx)
+
+            # Bilinearly interpolate the reference PSF spline
+            # coefficients at the (x_0, y_0) position. This is repeated
+            # for each new position, which costs some speed compared to
+            # caching the spline at the integer position.
+            coeff = self._interpolate_coeffs(weights, coeffs)
+            self._coeff_memo = (key, knots, coeff)
+
+        # now evaluate the PSF at the (x_0, y_0) subpixel position on
+        # the input (x, y) values
+        return self._evaluate_interpolated(x, y, flux, x_0, y_0, knots, coeff)
+
 
 class IntegratedGaussianPRF(Fittable2DModel):
     r"""
@@ -1037,6 +1394,7 @@ class IntegratedGaussianPRF(Fittable2DModel):
     sigma = Parameter(default=1, fixed=True)
 
     _erf = None
+    _inv_sqrt2 = 1.0 / math.sqrt(2)
 
     @property
     def bounding_box(self):
@@ -1056,11 +1414,28 @@ class IntegratedGaussianPRF(Fittable2DModel):
 
     def evaluate(self, x, y, flux, x_0, y_0, sigma):
         """Model function Gaussian PSF model."""
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if (x.ndim == 2 and x.shape == y.shape
+                and (x == x[0]).all() and (y == y[:, :1]).all()):
+            # the model is separable, so for (x, y) inputs on a
+            # (np.meshgrid-like) grid, evaluate the x and y terms only
+            # once per column and row; the product of the terms
+            # broadcasts to the full grid
+            x = x[:1]
+            y = y[:, :1]
+
+        # scale the pixel offsets once and reuse them for both pixel
+        # edges along each axis
+        erf = self._erf
+        scale = self._inv_sqrt2 / sigma
+        half = 0.5 * scale
+        xs = (x - x_0) * scale
+        ys = (y - y_0) * scale
+
         return (flux / 4
-                * ((self._erf((x - x_0 + 0.5) / (np.sqrt(2) * sigma))
-                    - self._erf((x - x_0 - 0.5) / (np.sqrt(2) * sigma)))
-                   * (self._erf((y - y_0 + 0.5) / (np.sqrt(2) * sigma))
-                      - self._erf((y - y_0 - 0.5) / (np.sqrt(2) * sigma)))))
+                * ((erf(xs + half) - erf(xs - half))
+                   * (erf(ys + half) - erf(ys - half))))
 
 
 class PRFAdapter(Fittable2DModel):
@@ -1113,7 +1488,7 @@ class PRFAdapter(Fittable2DModel):
 
         if renormalize_psf:
             from scipy.integrate import dblquad
-            self._psf_scale_factor = 1.0 / dblquad(self.psfmodel,
+            self._psf_scale_factor = 1.0 / dblquad(self._psfmodel_evaluator(),
                                                    -np.inf, np.inf,
                                                    lambda x: -np.inf,
                                                    lambda x: np.inf)[0]
@@ -1132,12 +1507,9 @@ class PRFAdapter(Fittable2DModel):
 
     def evaluate(self, x, y, flux, x_0, y_0):
         """The evaluation function for PRFAdapter."""
-        if not np.isscalar(flux):
-            flux = flux[0]
-        if not np.isscalar(x_0):
-            x_0 = x_0[0]
-        if not np.isscalar(y_0):
-            y_0 = y_0[0]
+        flux = _as_float(flux)
+        x_0 = _as_float(x_0)
+        y_0 = _as_float(y_0)
 
         if self.xname is None:
             dx = x - x_0
@@ -1158,15 +1530,35 @@ class PRFAdapter(Fittable2DModel):
             setattr(self.psfmodel, self.yname, flux * self._psf_scale_factor)
             return self._integrated_psfmodel(dx, dy)
 
+    def _psfmodel_evaluator(self):
+        """
+        Return a function that evaluates the PSF model at a scalar
+        ``(x, y)`` position with its current parameter values.
+
+        The integration calls the PSF model hundreds of times per
+        pixel. Calling the model ``evaluate`` method directly avoids
+        the input and parameter processing done when calling the model
+        itself, which is much slower than the evaluation for scalar
+        inputs.
+        """
+        psfmodel = self.psfmodel
+        params = [getattr(psfmodel, name).value
+                  for name in psfmodel.param_names]
+
+        def evaluator(x, y):
+            return psfmodel.evaluate(np.float64(x), np.float64(y), *params)
+
+        return evaluator
+
     def _integrated_psfmodel(self, dx, dy):
         from scipy.integrate import dblquad
 
         # infer type/shape from the PSF model.  Seems wasteful, but the
         # integration step is a *lot* more expensive so its just peanuts
-        out = np.empty_like(self.psfmodel(dx, dy))
-        outravel = out.ravel()
+        out = np.empty(np.shape(self.psfmodel(dx, dy)))
+        psfmodel = self._psfmodel_evaluator()
         for i, (xi, yi) in enumerate(zip(dx.ravel(), dy.ravel())):
-            outravel[i] = dblquad(self.psfmodel,
+            out.flat[i] = dblquad(psfmodel,
                                   xi - 0.5, xi + 0.5,
                                   lambda x: yi - 0.5, lambda x: yi + 0.5,
                                   **self._dblquadkwargs)[0]
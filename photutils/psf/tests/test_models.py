@@ -3,34 +3,54 @@
 Tests for the models module.
 """
 
+from functools import lru_cache
 from itertools import product
 
 import numpy as np
 import pytest
 from astropy.modeling.models import Gaussian2D, Moffat2D
 from astropy.nddata import NDData
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_equal
 
-from photutils.psf.models import (FittableImageModel, GriddedPSFModel,
-                                  IntegratedGaussianPRF, PRFAdapter)
+from photutils.psf.models import (EPSFModel, FittableImageModel,
+                                  GriddedPSFModel, IntegratedGaussianPRF,
+                                  PRFAdapter)
 from photutils.segmentation import SourceCatalog, detect_sources
 from photutils.utils._optional_deps import HAS_SCIPY
 
 
-@pytest.fixture(name='gmodel')
+@pytest.fixture(name='gmodel', scope='module')
 def fixture_gmodel():
     return Gaussian2D(x_stddev=3, y_stddev=3)
 
 
+@pytest.fixture(name='gmodel_grids', scope='module')
+def fixture_gmodel_grids(gmodel):
+    """
+    The ``(xx, yy, gmodel(xx, yy))`` images keyed by oversampling
+    factor.
+    """
+    grids = {}
+    yy, xx = np.mgrid[-2:3, -2:3]
+    grids[1] = (xx, yy, gmodel(xx, yy))
+    oversamp = 3
+    yy, xx = np.mgrid[-3:3.00001:(1 / oversamp), -3:3.00001:(1 / oversamp)]
+    grids[oversamp] = (xx, yy, gmodel(xx, yy))
+    return grids
+
+
 @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
 class TestFittableImageModel:
     """
     Tests for FittableImageModel.
     """
 
-    def test_fittable_image_model(self, gmodel):
-        yy, xx = np.mgrid[-2:3, -2:3]
-        model_nonorm = FittableImageModel(gmodel(xx, yy))
+    invalid_oversamplings = [-1, [-2, 4], (1, 4, 8), ((1, 2), (3, 4)),
+                             np.ones((2, 2, 2)), 2.1, np.nan, (1, np.inf)]
+
+    def test_fittable_image_model(self, gmodel, gmodel_grids):
+        im = gmodel_grids[1][2]
+        model_nonorm = FittableImageModel(im)
 
         assert_allclose(model_nonorm(0, 0), gmodel(0, 0))
         assert_allclose(model_nonorm(1, 1), gmodel(1, 1))
@@ -42,21 +62,25 @@ class TestFittableImageModel:
         assert_allclose(model_nonorm(-0.5, 1.75), gmodel(-0.5, 1.75),
                         rtol=.001)
 
-        model_norm = FittableImageModel(gmodel(xx, yy), normalize=True)
+        # the model values at the pixel centers are the image values
+        # scaled by the stored normalization constant
+        model_norm = FittableImageModel(im, normalize=True)
         assert not np.allclose(model_norm(0, 0), gmodel(0, 0))
-        assert_allclose(np.sum(model_norm(xx, yy)), 1)
+        assert model_norm._normalization_status == 0
+        assert_allclose(model_norm._normalization_constant * np.sum(im), 1)
+        assert_allclose(model_norm(0, 0),
+                        model_norm._normalization_constant * im[2, 2])
 
-        model_norm2 = FittableImageModel(gmodel(xx, yy), normalize=True,
+        model_norm2 = FittableImageModel(im, normalize=True,
                                          normalization_correction=2)
         assert not np.allclose(model_norm2(0, 0), gmodel(0, 0))
         assert_allclose(model_norm(0, 0), model_norm2(0, 0) * 2)
-        assert_allclose(np.sum(model_norm2(xx, yy)), 0.5)
+        assert_allclose(model_norm2._normalization_constant * np.sum(im),
+                        0.5)
 
-    def test_fittable_image_model_oversampling(self, gmodel):
+    def test_fittable_image_model_oversampling(self, gmodel, gmodel_grids):
         oversamp = 3  # oversampling factor
-        yy, xx = np.mgrid[-3:3.00001:(1 / oversamp), -3:3.00001:(1 / oversamp)]
-
-        im = gmodel(xx, yy)
+        im = gmodel_grids[oversamp][2]
         assert im.shape[0] > 7
 
         model_oversampled = FittableImageModel(im, oversampling=oversamp)
@@ -79,11 +103,9 @@ class TestFittableImageModel:
         assert not np.allclose(model_wrongsampled(-0.5, 1.75),
                                gmodel(-0.5, 1.75), rtol=.001)
 
-    def test_centering_oversampled(self, gmodel):
+    def test_centering_oversampled(self, gmodel, gmodel_grids):
         oversamp = 3
-        yy, xx = np.mgrid[-3:3.00001:(1 / oversamp), -3:3.00001:(1 / oversamp)]
-
-        model_oversampled = FittableImageModel(gmodel(xx, yy),
+        model_oversampled = FittableImageModel(gmodel_grids[oversamp][2],
                                                oversampling=oversamp)
 
         valcen = gmodel(0, 0)
@@ -99,6 +121,84 @@ class TestFittableImageModel:
         assert_allclose(val36, model_oversampled(2.5 + 0.66, -3.5 + 0.66),
                         rtol=1.0e-6)
 
+    def test_grid_evaluation(self, gmodel):
+        """
+        Test that evaluating the model on a grid gives the same result
+        as evaluating it on the same scattered points.
+        """
+        yy, xx = np.mgrid[-3:4, -3:4]
+        model = FittableImageModel(gmodel(xx, yy), x_0=0.3, y_0=-0.2)
+
+        y, x = np.mgrid[-4:4:0.7, -5:5:0.9]
+        assert_allclose(model(x, y), model(x.ravel(), y.ravel()).reshape(
+            x.shape), rtol=0, atol=0)
+
+    def test_array_parameters(self, gmodel):
+        """
+        Test that array model parameters broadcast with the input
+        coordinates.
+        """
+        yy, xx = np.mgrid[-3:4, -3:4]
+        im = gmodel(xx, yy)
+        model = FittableImageModel(im, flux=[1, 2], x_0=[0, 1], y_0=[0, 0])
+        result = model(0.5, 0.2)
+        assert result.shape == (2,)
+        expected = [FittableImageModel(im, flux=flux, x_0=x_0)(0.5, 0.2)
+                    for flux, x_0 in ((1, 0), (2, 1))]
+        assert_allclose(result, expected)
+
+        x = np.arange(3.0)
+        result = model.evaluate(x, 0.0, 1.0, np.array([[0.0], [1.0]]), 0.0)
+        assert result.shape == (2, 3)
+        assert_allclose(result[1], model.evaluate(x, 0.0, 1.0, 1.0, 0.0))
+
+    def test_data_copied(self, gmodel):
+        """
+        Test that the model is not affected by changes to the input
+        data and that the ePSF normalization does not modify the input
+        data.
+        """
+        yy, xx = np.mgrid[-3:4, -3:4]
+        data = gmodel(xx, yy)
+        data_orig = data.copy()
+        model = FittableImageModel(data)
+        assert not np.shares_memory(model.data, data)
+        value = model(0, 0)
+        data[:] = 0
+        assert_equal(model.data, data_orig)
+        assert_equal(model(0, 0), value)
+
+        data = data_orig.copy()
+        model = EPSFModel(data)
+        assert not np.shares_memory(model.data, data)
+        assert_equal(data, data_orig)
+
+        model = FittableImageModel(data.astype(np.float32))
+        assert model.data.dtype == float
+
+    def test_fill_value(self, gmodel):
+        yy, xx = np.mgrid[-3:4, -3:4]
+        model = FittableImageModel(gmodel(xx, yy), fill_value=-1.0)
+
+        # all points inside, partially outside, and all outside
+        x = np.arange(-2, 3)
+        assert np.all(model(x, 0) > 0)
+        assert_equal(model(x + 3, 0) == -1, [False, False, False, True, True])
+        assert_equal(model(x + 10, 0), -1)
+        assert_equal(model.evaluate(0, x - 10, flux=np.array([[2], [3]]),
+                                    x_0=0, y_0=0), np.full((2, 5), -1))
+
+    def test_normalized_data(self, gmodel):
+        yy, xx = np.mgrid[-3:4, -3:4]
+        model = FittableImageModel(gmodel(xx, yy), normalize=True)
+        normdata = model.normalized_data
+        assert_allclose(np.sum(normdata), 1)
+        assert model.normalized_data is normdata
+        assert not normdata.flags.writeable
+
+        model.normalization_correction = 2
+        assert_allclose(np.sum(model.normalized_data), 0.5)
+
     def test_oversampling_inputs(self):
         data = np.arange(30).reshape(5, 6)
         for oversampling in [4, (3, 3), (3, 4)]:
@@ -109,25 +209,24 @@ class TestFittableImageModel:
                 _oversamp = tuple(float(o) for o in oversampling)
             assert np.all(fim._oversampling == _oversamp)
 
-        for oversampling in [-1, [-2, 4], (1, 4, 8), ((1, 2), (3, 4)),
-                             np.ones((2, 2, 2)), 2.1, np.nan, (1, np.inf)]:
-            with pytest.raises(ValueError):
-                FittableImageModel(data, oversampling=oversampling)
+    @pytest.mark.parametrize('oversampling', invalid_oversamplings)
+    def test_invalid_oversampling(self, oversampling):
+        data = np.arange(30).reshape(5, 6)
+        with pytest.raises(ValueError):
+            FittableImageModel(data, oversampling=oversampling)
 
 
-@pytest.fixture(name='psfmodel')
+@pytest.fixture(name='psfmodel', scope='module')
 def fixture_griddedpsf_data():
-    psfs = []
-    y, x = np.mgrid[0:101, 0:101]
-    for i in range(16):
-        theta = i * 10.0 * np.pi / 180.0
-        g = Gaussian2D(1, 50, 50, 10, 5, theta=theta)
-        m = g(x, y)
-        psfs.append(m)
+    # evaluate all 16 rotated PSFs at once by broadcasting theta
+    y, x = np.ogrid[0:101, 0:101]
+    theta = np.deg2rad(np.arange(16) * 10.0)[:, np.newaxis, np.newaxis]
+    psfs = Gaussian2D.evaluate(x, y, 1, 50, 50, 10, 5, theta)
 
     xgrid = [0, 40, 160, 200]
     ygrid = [0, 60, 140, 200]
-    grid_xypos = list(product(xgrid, ygrid))
+    xgrid, ygrid = np.meshgrid(xgrid, ygrid, indexing='ij')
+    grid_xypos = np.column_stack((xgrid.ravel(), ygrid.ravel()))
 
     meta = {}
     meta['grid_xypos'] = grid_xypos
@@ -162,48 +261,119 @@ class TestGriddedPSFModel:
 
     @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
     def test_gridded_psf_model_eval_outside_grid(self, psfmodel):
-        y, x = np.mgrid[-50:50, -50:50]
+        y, x = np.ogrid[-50:50, -50:50]
         psf1 = psfmodel.evaluate(x=x, y=y, flux=100, x_0=0, y_0=0)
-        y, x = np.mgrid[-60:40, -60:40]
+        y, x = np.ogrid[-60:40, -60:40]
         psf2 = psfmodel.evaluate(x=x, y=y, flux=100, x_0=-10, y_0=-10)
         assert_allclose(psf1, psf2)
 
-        y, x = np.mgrid[150:250, 150:250]
+        y, x = np.ogrid[150:250, 150:250]
         psf3 = psfmodel.evaluate(x=x, y=y, flux=100, x_0=200, y_0=200)
-        y, x = np.mgrid[170:270, 170:270]
+        y, x = np.ogrid[170:270, 170:270]
         psf4 = psfmodel.evaluate(x=x, y=y, flux=100, x_0=220, y_0=220)
         assert_allclose(psf3, psf4)
 
     @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
-    def test_gridded_psf_model_interp(self, psfmodel):
-        # test xyref length
-        with pytest.raises(TypeError):
-            psfmodel._bilinear_interp([1, 1], 1, 1, 1)
+    def test_gridded_psf_model_subpixel_interp(self, psfmodel):
+        """
+        Test that the reference PSFs are interpolated at the exact
+        (x_0, y_0) position.
+        """
+        y, x = np.mgrid[-10:11, -10:11]
+        psf0 = psfmodel.evaluate(x=x, y=y, flux=1, x_0=0, y_0=0)
+        x_0 = 40.6
+        psf = psfmodel.evaluate(x=x + x_0, y=y + 60, flux=1, x_0=x_0,
+                                y_0=60)
+        psf1 = psfmodel.evaluate(x=x + 40, y=y + 60, flux=1, x_0=40, y_0=60)
+        psf2 = psfmodel.evaluate(x=x + 160, y=y + 60, flux=1, x_0=160,
+                                 y_0=60)
+        weight = (x_0 - 40) / (160 - 40)
+        assert_allclose(psf, (1 - weight) * psf1 + weight * psf2)
+        assert not np.allclose(psf, psf0)
+
+    def test_bilinear_weights(self):
+        weights = GriddedPSFModel._bilinear_weights(0.0, 0.0)
+        assert_equal(weights, [1, 0, 0, 0])
+        weights = GriddedPSFModel._bilinear_weights(1.0, 0.0)
+        assert_equal(weights, [0, 0, 1, 0])
+        weights = GriddedPSFModel._bilinear_weights(0.25, 0.5)
+        assert_allclose(weights, [0.375, 0.375, 0.125, 0.125])
 
-        # test if refxy points form a rectangle
-        with pytest.raises(ValueError):
-            xyref = [[0, 0], [0, 1], [1, 0], [2, 2]]
-            zref = np.ones((4, 4, 4))
-            psfmodel._bilinear_interp(xyref, zref, 1, 1)
+    @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
+    def test_list_parameters(self, psfmodel):
+        assert_equal(psfmodel.evaluate(5, 5, [2.0], [5.0], [5.0]),
+                     psfmodel.evaluate(5, 5, 2.0, 5.0, 5.0))
 
-        # test if xi and yi are outside of xyref
-        xyref = [[0, 0], [0, 1], [1, 0], [1, 1]]
-        zref = np.ones((4, 4, 4))
-        with pytest.raises(ValueError):
-            psfmodel._bilinear_interp(xyref, zref, 100, 1)
-        with pytest.raises(ValueError):
-            psfmodel._bilinear_interp(xyref, zref, 1, 100)
+    def test_locate(self, psfmodel):
+        # xgrid = [0, 40, 160, 200] and ygrid = [0, 60, 140, 200]
+        assert psfmodel._locate(100, 30) == (1, 0, 0.5, 0.5)
+        assert psfmodel._locate(40, 60) == (0, 0, 1.0, 1.0)
+        assert psfmodel._locate(200, 0) == (2, 0, 1.0, 0.0)
+        assert psfmodel._locate(-40, 230) == (0, 2, -1.0, 1.5)
 
-        # test non-scalar xi and yi
-        idx = [0, 1, 4, 5]
-        xyref = np.array(psfmodel.grid_xypos)[idx]
-        psfs = psfmodel.data[idx, :, :]
-        val1 = psfmodel._bilinear_interp(xyref, psfs, 10, 20)
-        val2 = psfmodel._bilinear_interp(xyref, psfs, [10], [20])
-        assert_allclose(val1, val2)
+    @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
+    def test_float32_data(self, psfmodel):
+        data = psfmodel.data.astype(np.float32)
+        nddata = NDData(data, meta=psfmodel.meta)
+        psfmodel32 = GriddedPSFModel(nddata)
+        assert psfmodel32._data.dtype == np.float32
+
+        psfmodel64 = GriddedPSFModel(NDData(data.astype(float),
+                                            meta=psfmodel.meta))
+        y, x = np.mgrid[0:100, 0:100]
+        assert_equal(psfmodel32.evaluate(x, y, 100, 40.3, 60.2),
+                     psfmodel64.evaluate(x, y, 100, 40.3, 60.2))
+
+    def test_find_bounding_points(self, psfmodel):
+        xyref = np.array(psfmodel.grid_xypos)
+        for xidx, yidx in product(range(3), range(3)):
+            indices = psfmodel._find_bounding_points(xidx, yidx)
+            expected = list(product(psfmodel._xgrid[xidx:xidx + 2],
+                                    psfmodel._ygrid[yidx:yidx + 2]))
+            assert_equal(xyref[indices], expected)
+
+    def test_find_cell_index(self):
+        grid = np.linspace(-3.1, 7.7, 13)
+        step = GriddedPSFModel._grid_step(grid)
+        assert step is None
+        assert GriddedPSFModel._grid_step(grid[:2]) is not None
+
+        # the direct index calculation for uniform grids must match
+        # the binary search, including at and next to the grid values
+        values = np.concatenate((np.linspace(-5, 10, 101), grid,
+                                 np.nextafter(grid, np.inf),
+                                 np.nextafter(grid, -np.inf)))
+        for value in values:
+            idx = GriddedPSFModel._find_cell_index(grid, None, value)
+            assert GriddedPSFModel._find_cell_index(grid, 0.9, value) == idx
+
+    # a single reference PSF, a single column of reference PSFs
+    # (grid_xypos x = 0), and a single row of reference PSFs (y = 60)
+    @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
+    @pytest.mark.parametrize(('indices', 'xypos', 'nearest_xypos'),
+                             [([5], (120, 50), (40, 60)),
+                              ([0, 1, 2, 3], (120, 70), (0, 60)),
+                              ([1, 5, 9, 13], (150, 300), (160, 60))])
+    def test_degenerate_grid(self, psfmodel, indices, xypos, nearest_xypos):
+        meta = {'grid_xypos': psfmodel.grid_xypos[indices],
+                'oversampling': psfmodel.oversampling}
+        model = GriddedPSFModel(NDData(psfmodel.data[indices], meta=meta))
+        assert model._cell_ref_indices is None
+
+        # the nearest reference PSF is used
+        yy, xx = np.mgrid[-10:11, -10:11]
+        x_0, y_0 = xypos
+        xref, yref = nearest_xypos
+        psf = model.evaluate(xx + x_0, yy + y_0, 10, x_0, y_0)
+        expected = psfmodel.evaluate(xx + xref, yy + yref, 10, xref, yref)
+        assert_allclose(psf, expected)
+        model.x_0 = x_0
+        model.y_0 = y_0
+        model.flux = 10
+        assert_allclose(model(xx + x_0, yy + y_0), expected)
 
     def test_gridded_psf_model_invalid_inputs(self):
-        data = np.ones((4, 3, 3))
+        data = np.ones((4, 3, 3), dtype=np.float32)
 
         # check if NDData
         with pytest.raises(TypeError):
@@ -230,6 +400,11 @@ class TestGriddedPSFModel:
         meta = {'grid_xypos': [[0, 0], [1, 0], [1, 0], [3, 4]],
                 'oversampling': 4}
         nddata = NDData(data, meta=meta)
+        with pytest.raises(ValueError):
+            GriddedPSFModel(nddata)
+        meta = {'grid_xypos': [[0, 0], [0, 1], [1, 0], [0, 0]],
+                'oversampling': 4}
+        nddata = NDData(data, meta=meta)
         with pytest.raises(ValueError):
             GriddedPSFModel(nddata)
 
@@ -286,10 +461,9 @@ class TestGriddedPSFModel:
         assert 64.0 < orients[3] < 64.2
 
     def test_copy(self, psfmodel):
-        flux = psfmodel.flux.value
         new_model = psfmodel.copy()
-        new_model.flux = 100
-        assert new_model.flux.value != flux
+        assert new_model is not psfmodel
+        assert_equal(new_model.parameters, psfmodel.parameters)
         assert new_model._data_input is psfmodel._data_input
 
     def test_deepcopy(self, psfmodel):
@@ -300,20 +474,41 @@ class TestGriddedPSFModel:
 
     @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
     def test_cache(self, psfmodel):
-        for x, y in psfmodel.grid_xypos:
-            psfmodel.x_0 = x
-            psfmodel.y_0 = y
-            psfmodel(0, 0)
-            psfmodel(1, 1)
-
-        assert psfmodel._cache_info().hits == 16
-        assert psfmodel._cache_info().misses == 16
-        assert psfmodel._cache_info().currsize == 16
+        # use a copy (which has its own empty cache) because the
+        # fixture is shared between tests
+        psfmodel = psfmodel.copy()
+        flux = psfmodel.flux.value
+        for x_0, y_0 in psfmodel.grid_xypos:
+            psfmodel.evaluate(0, 0, flux, x_0, y_0)
+            psfmodel.evaluate(1, 1, flux, x_0, y_0)
+
+        # the cache is keyed on the grid cell; the 16 grid points lie
+        # in 9 grid cells, and the second evaluation at each position
+        # uses the memoized interpolated coefficients
+        assert psfmodel._cache_info().hits == 7
+        assert psfmodel._cache_info().misses == 9
+        assert psfmodel._cache_info().currsize == 9
+
+        # the spline of each reference PSF is computed only once
+        assert psfmodel._calc_spline.cache_info().misses == 16
+        assert psfmodel._calc_spline.cache_info().maxsize == 16
+        assert psfmodel._coeff_memo[0][2:] == (200, 200)
 
         psfmodel.clear_cache()
+        assert psfmodel._coeff_memo is None
         assert psfmodel._cache_info().hits == 0
         assert psfmodel._cache_info().misses == 0
         assert psfmodel._cache_info().currsize == 0
+        assert psfmodel._calc_spline.cache_info().currsize == 0
+
+
+@lru_cache(maxsize=None)
+def _get_prf(sigma):
+    """
+    Return a shared IntegratedGaussianPRF; the tests using it must not
+    modify its parameters.
+    """
+    return IntegratedGaussianPRF(sigma=sigma)
 
 
 @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
@@ -332,7 +527,7 @@ class TestIntegratedGaussianPRF:
         sum of pixels.
         """
 
-        gauss_psf = IntegratedGaussianPRF(width)
+        gauss_psf = _get_prf(width)
         y, x = np.mgrid[-10:11, -10:11]
         assert_allclose(gauss_psf(x, y).sum(), 1)
 
@@ -343,10 +538,50 @@ class TestIntegratedGaussianPRF:
         scales.
         """
 
-        psf = IntegratedGaussianPRF(sigma=sigma)
-        y, x = np.mgrid[-100:101, -100:101]
+        psf = _get_prf(sigma)
+        # the grid only needs to cover the PRF support; the largest
+        # sigma is kept on the full grid
+        if sigma == max(self.sigmas):
+            size = 100
+        else:
+            size = max(20, int(np.ceil(8 * sigma)))
+        y, x = np.mgrid[-size:size + 1, -size:size + 1]
         assert_allclose(psf(y, x).sum(), 1)
 
+    def test_grid_evaluation(self):
+        """
+        Test that evaluating the model on a grid gives the same result
+        as evaluating it on the same scattered points.
+        """
+        psf = IntegratedGaussianPRF(sigma=1.5, x_0=0.3, y_0=-0.2)
+        y, x = np.mgrid[-5:6, -4:5]
+        assert_allclose(psf(x, y), psf(x.ravel(), y.ravel()).reshape(
+            x.shape), rtol=0, atol=0)
+
+
+@pytest.fixture(name='moffat_integral', scope='module')
+def fixture_moffat_integral():
+    """
+    The integral (and its error) of the normalized gamma=1.5 Moffat over
+    the central 3x3 pixels.
+    """
+    from scipy.integrate import dblquad
+
+    mof = TestPRFAdapter.normalize_moffat(Moffat2D(gamma=1.5, alpha=4.8))
+    return dblquad(mof, -1.5, 1.5, lambda x: -1.5, lambda x: 1.5)
+
+
+@pytest.fixture(name='moffat_itol', scope='module')
+def fixture_moffat_itol():
+    """
+    The integration error of the normalized gamma=1 Moffat over the
+    central 4x4 pixels.
+    """
+    from scipy.integrate import dblquad
+
+    mof = TestPRFAdapter.normalize_moffat(Moffat2D(gamma=1, alpha=4.8))
+    return dblquad(mof, -2, 2, lambda x: -2, lambda x: 2)[1]
+
 
 @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
 class TestPRFAdapter:
@@ -354,7 +589,8 @@ class TestPRFAdapter:
     Tests for PRFAdapter.
     """
 
-    def normalize_moffat(self, mof):
+    @staticmethod
+    def normalize_moffat(mof):
         # this is the analytic value needed to get a total flux of 1
         mof = mof.copy()
         mof.amplitude = (mof.alpha - 1) / (np.pi * mof.gamma**2)
@@ -384,9 +620,7 @@ class TestPRFAdapter:
          'renormalize_psf': False},
         {'xname': None, 'yname': None, 'fluxname': None,
          'renormalize_psf': False}])
-    def test_prfadapter_integrates(self, adapterkwargs):
-        from scipy.integrate import dblquad
-
+    def test_prfadapter_integrates(self, adapterkwargs, moffat_integral):
         mof = Moffat2D(gamma=1.5, alpha=4.8)
         if not adapterkwargs['renormalize_psf']:
             mof = self.normalize_moffat(mof)
@@ -397,11 +631,7 @@ class TestPRFAdapter:
         xg, yg = np.meshgrid(*([(-1, 0, 1)] * 2))
         evalmod = prf1(xg, yg)
 
-        if adapterkwargs['renormalize_psf']:
-            mof = self.normalize_moffat(mof)
-
-        integrand, itol = dblquad(mof, -1.5, 1.5, lambda x: -1.5,
-                                  lambda x: 1.5)
+        integrand, itol = moffat_integral
         assert_allclose(np.sum(evalmod), integrand, atol=itol * 10)
 
     @pytest.mark.parametrize("adapterkwargs", [
@@ -409,9 +639,7 @@ class TestPRFAdapter:
          'renormalize_psf': False},
         {'xname': None, 'yname': None, 'fluxname': None,
          'renormalize_psf': False}])
-    def test_prfadapter_sizematch(self, adapterkwargs):
-        from scipy.integrate import dblquad
-
+    def test_prfadapter_sizematch(self, adapterkwargs, moffat_itol):
         mof1 = self.normalize_moffat(Moffat2D(gamma=1, alpha=4.8))
         prf1 = PRFAdapter(mof1, **adapterkwargs)
 
@@ -426,7 +654,23 @@ class TestPRFAdapter:
         eval11 = prf1(xg1, yg1)
         eval22 = prf2(xg2, yg2)
 
-        _, itol = dblquad(mof1, -2, 2, lambda x: -2, lambda x: 2)
-        # it's a bit of a guess that the above itol is appropriate, but
-        # it should be close
-        assert_allclose(np.sum(eval11), np.sum(eval22), atol=itol * 100)
+        # it's a bit of a guess that the moffat_itol integration error
+        # is appropriate, but it should be close
+        assert_allclose(np.sum(eval11), np.sum(eval22),
+                        atol=moffat_itol * 100)
+
+    def test_prfadapter_image_model(self, gmodel):
+        """
+        Test PRFAdapter wrapping an image model evaluated on a 2D grid.
+        """
+        yy, xx = np.mgrid[-3:4, -3:4]
+        prf = PRFAdapter(FittableImageModel(gmodel(xx, yy)),
+                         renormalize_psf=False)
+
+        xg, yg = np.meshgrid(*([(-1, 0, 1)] * 2))
+        result = prf(xg, yg)
+        expected = [[prf(xi, yi) for xi, yi in zip(xrow, yrow)]
+                    for xrow, yrow in zip(xg, yg)]
+        assert_allclose(result, expected)
+        assert_allclose(result, result.T)
+        assert result[1, 1] > result[0, 1] > result[0, 0] > 0
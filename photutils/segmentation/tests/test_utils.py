@@ -23,17 +23,11 @@ def test_make_2dgaussian_kernel():
 
 
 @pytest.mark.skipif(not HAS_SCIPY, reason='scipy is required')
-def test_make_2dgaussian_kernel_modes():
-    kernel = make_2dgaussian_kernel(3.0, 5)
-    assert_allclose(kernel.array.sum(), 1.0)
-
-    kernel = make_2dgaussian_kernel(3.0, 5, mode='center')
-    assert_allclose(kernel.array.sum(), 1.0)
-
-    kernel = make_2dgaussian_kernel(3.0, 5, mode='linear_interp')
-    assert_allclose(kernel.array.sum(), 1.0)
-
-    kernel = make_2dgaussian_kernel(3.0, 5, mode='integrate')
+@pytest.mark.parametrize('mode', [None, 'center', 'linear_interp',
+                                  'integrate'])
+def test_make_2dgaussian_kernel_modes(mode):
+    kwargs = {} if mode is None else {'mode': mode}
+    kernel = make_2dgaussian_kernel(3.0, 5, **kwargs)
     assert_allclose(kernel.array.sum(), 1.0)
 
 
@@ -67,6 +61,7 @@ def test_mask_to_mirrored_value():
     data_ref[1, 1] = data[3, 3]
     mirror_data = _mask_to_mirrored_value(data, mask, center)
     assert_allclose(mirror_data, data_ref, rtol=0, atol=1.0e-6)
+    assert mirror_data.dtype == data.dtype
 
 
 def test_mask_to_mirrored_value_range():
@@ -94,7 +89,7 @@ def test_mask_to_mirrored_value_masked():
     replace_mask.
     """
     center = (2.0, 2.0)
-    data = np.arange(25).reshape(5, 5)
+    data = np.arange(25, dtype=np.float32).reshape(5, 5)
     mask = np.zeros(data.shape, dtype=bool)
     mask[0, 0] = True
     mask[1, 1] = True
@@ -106,7 +101,6 @@ def test_mask_to_mirrored_value_masked():
     data_ref[3, 3] = 0.0
     data_ref[4, 4] = 0.0
     mirror_data = _mask_to_mirrored_value(data, mask, center)
-    mirror_data = _mask_to_mirrored_value(data, mask, center)
     assert_allclose(mirror_data, data_ref, rtol=0, atol=1.0e-6)
 
 
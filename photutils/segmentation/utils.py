@@ -144,30 +144,22 @@ def _mask_to_mirrored_value(data, replace_mask, xycenter, mask=None):
     xmirror = 2 * int(xycenter[0] + 0.5) - xmasked
     ymirror = 2 * int(xycenter[1] + 0.5) - ymasked
 
-    # Find mirrored pixels that are outside of the image
-    badmask = ((xmirror < 0) | (ymirror < 0) | (xmirror >= data.shape[1])
-               | (ymirror >= data.shape[0]))
-
-    # remove them from the set of replace_mask pixels and set them to
-    # zero
-    if np.any(badmask):
-        outdata[ymasked[badmask], xmasked[badmask]] = 0.0
-        # remove the badmask pixels from pixels to be replaced
-        goodmask = ~badmask
-        ymasked = ymasked[goodmask]
-        xmasked = xmasked[goodmask]
-        xmirror = xmirror[goodmask]
-        ymirror = ymirror[goodmask]
-
-    outdata[ymasked, xmasked] = outdata[ymirror, xmirror]
-
-    # Find mirrored pixels that are masked and replace_mask pixels that are
-    # mirrored to other replace_mask pixels. Set them both to zero.
+    # Find mirrored pixels that are inside of the image
+    inside = ((xmirror >= 0) & (ymirror >= 0) & (xmirror < data.shape[1])
+              & (ymirror < data.shape[0]))
+    xmirror = xmirror[inside]
+    ymirror = ymirror[inside]
+
+    # Mirrored pixels that are masked or are themselves replace_mask
+    # pixels cannot be used
     mirror_mask = replace_mask[ymirror, xmirror]
     if mask is not None:
         mirror_mask |= mask[ymirror, xmirror]
-    xbad = xmasked[mirror_mask]
-    ybad = ymasked[mirror_mask]
-    outdata[ybad, xbad] = 0.0
+
+    # replace_mask pixels without a usable mirrored pixel are set to
+    # zero; all replaced values are written in a single pass
+    values = np.zeros(xmasked.shape, dtype=outdata.dtype)
+    values[inside] = np.where(mirror_mask, 0, data[ymirror, xmirror])
+    outdata[ymasked, xmasked] = values
 
     return outdata